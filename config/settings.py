@@ -3,7 +3,24 @@ Application configuration and constants.
 All environment variables and magic values centralized here.
 """
 import os
-from typing import Dict, Any
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable."""
+    return int(os.getenv(name, str(default)))
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable."""
+    return float(os.getenv(name, str(default)))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable, falling back to the default when unset or empty."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.lower() in ("1", "true", "yes")
 
 
 class Settings:
@@ -11,23 +28,41 @@ class Settings:
     
     # Azure Configuration
     KEY_VAULT_NAME: str = os.getenv("KEY_VAULT_NAME", "pgk-key-vault")
+    # App Service, Functions and Container Apps expose IDENTITY_ENDPOINT/MSI_ENDPOINT and
+    # AKS workload identity exposes AZURE_FEDERATED_TOKEN_FILE; VMs serve managed identity
+    # via IMDS, so set USE_MANAGED_IDENTITY=true there. An explicit value always wins.
+    USE_MANAGED_IDENTITY: bool = _env_bool(
+        "USE_MANAGED_IDENTITY",
+        any(os.getenv(name) for name in (
+            "IDENTITY_ENDPOINT", "MSI_ENDPOINT", "AZURE_FEDERATED_TOKEN_FILE"
+        ))
+    )
     
     # API Configuration
     OPENWEATHER_BASE_URL: str = "https://api.openweathermap.org/data/2.5"
     OPENWEATHER_FORECAST_ENDPOINT: str = f"{OPENWEATHER_BASE_URL}/forecast"
     
     # OpenAI Configuration
-    OPENAI_API_URL: str = "https://api.openai.com/v1/chat/completions"
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-    OPENAI_MAX_COMPLETION_TOKENS: int = int(os.getenv("OPENAI_MAX_COMPLETION_TOKENS", "1000"))
-    OPENAI_TEMPERATURE: float = float(os.getenv("OPENAI_TEMPERATURE", "1.1"))
+    OPENAI_MAX_COMPLETION_TOKENS: int = _env_int("OPENAI_MAX_COMPLETION_TOKENS", 1000)
+    OPENAI_TEMPERATURE: float = _env_float("OPENAI_TEMPERATURE", 1.1)
     
     # Key Vault Secret Names
     OPENWEATHER_API_KEY_SECRET: str = "OWM-API-KEY"
     OPENAI_API_KEY_SECRET: str = "OPENAI-API-KEY"
     
     # Request Configuration
-    API_TIMEOUT_SECONDS: int = int(os.getenv("API_TIMEOUT_SECONDS", "30"))
+    API_TIMEOUT_SECONDS: int = _env_int("API_TIMEOUT_SECONDS", 30)
+    HTTP_RETRY_ATTEMPTS: int = _env_int("HTTP_RETRY_ATTEMPTS", 3)
+    HTTP_RETRY_BACKOFF_FACTOR: float = 1.0
+    HTTP_RETRY_STATUS_CODES: frozenset = frozenset({429, 500, 502, 503, 504})
+    # Statuses whose Retry-After header overrides the backoff delay (as urllib3 does)
+    HTTP_RETRY_AFTER_STATUS_CODES: frozenset = frozenset({413, 429, 503})
+    HTTP_MAX_CONNECTIONS: int = 32
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    # Keep idle connections long enough to span gaps between tool calls (httpx default is 5s)
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = _env_float("HTTP_KEEPALIVE_EXPIRY_SECONDS", 60.0)
     
     # Validation Constants
     MIN_LATITUDE: float = -90.0
@@ -38,27 +73,17 @@ class Settings:
     # Forecast Configuration
     EXPECTED_FORECAST_DAYS: int = 5
     
+    # Cache Configuration (OpenWeather refreshes data roughly every 10 minutes)
+    WEATHER_CACHE_TTL_SECONDS: int = _env_int("WEATHER_CACHE_TTL_SECONDS", 600)
+    WEATHER_CACHE_MAX_ENTRIES: int = 128
+    # Secrets are re-read after this long so Key Vault rotations are picked up
+    SECRET_CACHE_TTL_SECONDS: int = _env_int("SECRET_CACHE_TTL_SECONDS", 3600)
+    
     @classmethod
     def validate_required_settings(cls) -> None:
         """Validate that all required settings are present."""
         if not cls.KEY_VAULT_NAME:
             raise ValueError("KEY_VAULT_NAME environment variable is required")
-    
-    @classmethod
-    def get_azure_credential_config(cls) -> Dict[str, bool]:
-        """Get Azure credential configuration for managed identity."""
-        return {
-            "exclude_environment_credential": True,
-            "exclude_managed_identity_credential": False,
-            "exclude_shared_token_cache_credential": True,
-            "exclude_visual_studio_code_credential": True,
-            "exclude_cli_credential": True,
-            "exclude_interactive_browser_credential": True,
-            "exclude_powershell_credential": True,
-            "exclude_developer_sign_on_credential": True,
-            "exclude_visual_studio_credential": True,
-            "exclude_azure_portal_credential": True,
-        }
 
 
 # Global settings instance
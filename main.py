@@ -1,9 +1,12 @@
 # main.py (root level)
+import asyncio
 import logging
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
 from mcp.server.fastmcp import FastMCP
 
 # Direct imports since services are at same level
+from services._http import close_shared_client
 from services.key_vault_service import KeyVaultService
 from services.weather_service import WeatherService  
 from services.ai_service import AIService
@@ -17,8 +20,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# The lifespan is entered once per client session on the SSE and streamable-HTTP
+# transports, so the shared HTTP client is reference-counted across sessions:
+# the first session starts the warmup and the last one to end closes the pool.
+_active_sessions = 0
+_warmup_task: Optional[asyncio.Task] = None
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Warm the OpenWeather connection on startup and release pooled connections on shutdown."""
+    global _active_sessions, _warmup_task
+    if _active_sessions == 0:
+        _warmup_task = asyncio.create_task(weather_service.warmup())
+    _active_sessions += 1
+    try:
+        yield
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            _warmup_task.cancel()
+            await close_shared_client()
+
 # Initialize FastMCP server
-mcp = FastMCP("weather-server")
+mcp = FastMCP("weather-server", lifespan=lifespan)
 
 # Initialize services
 key_vault_service = KeyVaultService()
@@ -49,11 +73,12 @@ async def get_weather_forecast(location: str) -> str:
         logger.info("Getting forecast for: %s", location)
         forecast_data = await weather_service.get_forecast(location)
         
-        forecast_text = f"5-day forecast for {location}:\n"
-        for day in forecast_data:
-            forecast_text += f"\n{day['date']}: {day['temp_high']}°/{day['temp_low']}° - {day['description']}"
-            
-        return forecast_text
+        lines = [f"5-day forecast for {location}:", ""]
+        lines.extend(
+            f"{day['date']}: {day['temp_high']}°/{day['temp_low']}° - {day['description']}"
+            for day in forecast_data
+        )
+        return "\n".join(lines)
         
     except Exception as e:
         logger.error("Forecast request failed: %s", e)
@@ -65,8 +90,10 @@ async def get_weather_insights(location: str) -> str:
     try:
         logger.info("Getting AI insights for: %s", location)
         
-        weather_data = await weather_service.get_current_weather(location)
-        forecast_data = await weather_service.get_forecast(location)
+        weather_data, forecast_data = await asyncio.gather(
+            weather_service.get_current_weather(location),
+            weather_service.get_forecast(location)
+        )
         
         insights = await ai_service.generate_weather_insights(
             weather_data, 
@@ -2,10 +2,20 @@
 Data models for weather forecast application.
 Provides type-safe, validated data structures.
 """
+from array import array
 from dataclasses import dataclass, field
 from datetime import date, datetime
+from functools import cached_property
+from itertools import groupby, islice
 from typing import List, Dict, Optional, Any
-import json
+import orjson
+
+from config.settings import Settings
+
+# Coordinate bounds as float module globals, avoiding int/float promotion per check
+_MIN_LAT, _MAX_LAT = Settings.MIN_LATITUDE, Settings.MAX_LATITUDE
+_MIN_LON, _MAX_LON = Settings.MIN_LONGITUDE, Settings.MAX_LONGITUDE
+_FORECAST_DAYS = Settings.EXPECTED_FORECAST_DAYS
 
 
 @dataclass(frozen=True)
@@ -16,38 +26,83 @@ class Location:
     
     def __post_init__(self):
         """Validate coordinates after initialization."""
-        if not (-90 <= self.latitude <= 90):
-            raise ValueError(f"Invalid latitude: {self.latitude}. Must be between -90 and 90.")
-        if not (-180 <= self.longitude <= 180):
-            raise ValueError(f"Invalid longitude: {self.longitude}. Must be between -180 and 180.")
+        lat, lon = self.latitude, self.longitude
+        # Single combined check on the happy path; NaN fails every comparison
+        if not ((lat >= _MIN_LAT) & (lat <= _MAX_LAT) & (lon >= _MIN_LON) & (lon <= _MAX_LON)):
+            if not (_MIN_LAT <= lat <= _MAX_LAT):
+                raise ValueError(f"Invalid latitude: {lat}. Must be between {_MIN_LAT:g} and {_MAX_LAT:g}.")
+            raise ValueError(f"Invalid longitude: {lon}. Must be between {_MIN_LON:g} and {_MAX_LON:g}.")
 
 
-@dataclass
 class WeatherCondition:
     """Represents weather conditions for a specific time period."""
-    timestamp: datetime
-    temperature: float
-    temperature_min: float
-    temperature_max: float
-    description: str
-    humidity: Optional[float] = None
+    __slots__ = (
+        "timestamp",
+        "temperature",
+        "temperature_min",
+        "temperature_max",
+        "description",
+        "humidity",
+        "date",
+    )
     
-    @property
-    def date(self) -> date:
-        """Get the date component of the timestamp."""
-        return self.timestamp.date()
+    def __init__(
+        self,
+        timestamp: datetime,
+        temperature: float,
+        temperature_min: float,
+        temperature_max: float,
+        description: str,
+        humidity: Optional[float] = None,
+    ):
+        self.timestamp = timestamp
+        self.temperature = temperature
+        self.temperature_min = temperature_min
+        self.temperature_max = temperature_max
+        self.description = description
+        self.humidity = humidity
+        # Date component of the timestamp, computed once for daily grouping
+        self.date = timestamp.date()
+    
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            (self.timestamp, self.temperature, self.temperature_min,
+             self.temperature_max, self.description, self.humidity)
+            == (other.timestamp, other.temperature, other.temperature_min,
+                other.temperature_max, other.description, other.humidity)
+        )
+    
+    # Mutable value objects stay unhashable, as they were as dataclasses
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"WeatherCondition(timestamp={self.timestamp!r}, temperature={self.temperature!r}, "
+            f"temperature_min={self.temperature_min!r}, temperature_max={self.temperature_max!r}, "
+            f"description={self.description!r}, humidity={self.humidity!r})"
+        )
 
 
-@dataclass
 class DailyWeatherSummary:
     """Aggregated weather summary for a single day."""
-    date: date
-    max_temperature: float
-    min_temperature: float
-    weather_conditions: List[str]
+    # __dict__ is kept so cached_property can store computed values
+    __slots__ = ("date", "max_temperature", "min_temperature", "weather_conditions", "__dict__")
     
-    def __post_init__(self):
-        """Validate data after initialization."""
+    def __init__(
+        self,
+        date: date,
+        max_temperature: float,
+        min_temperature: float,
+        weather_conditions: List[str],
+    ):
+        self.date = date
+        self.max_temperature = max_temperature
+        self.min_temperature = min_temperature
+        self.weather_conditions = weather_conditions
+        
+        # Validate data after initialization
         if self.max_temperature < self.min_temperature:
             raise ValueError(
                 f"Max temperature ({self.max_temperature}) cannot be less than "
@@ -61,7 +116,7 @@ class DailyWeatherSummary:
         """Calculate the temperature range for the day."""
         return self.max_temperature - self.min_temperature
     
-    @property
+    @cached_property
     def formatted_date(self) -> str:
         """Return date in YYYY-MM-DD format."""
         return self.date.strftime('%Y-%m-%d')
@@ -72,7 +127,7 @@ class DailyWeatherSummary:
     #     """Return weather conditions as a comma-separated string."""
     #     return ', '.join(self.weather_conditions)
 
-    @property
+    @cached_property
     def conditions_summary(self) -> str:
         """Returns weather conditions as readable string."""
         if not self.weather_conditions:
@@ -95,41 +150,71 @@ class DailyWeatherSummary:
         """Professional string representation."""
         return f"{self.formatted_date}: {self.min_temperature} - {self.max_temperature} ({self.conditions_summary})"
     
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            (self.date, self.max_temperature, self.min_temperature, self.weather_conditions)
+            == (other.date, other.max_temperature, other.min_temperature, other.weather_conditions)
+        )
+    
+    # Mutable value objects stay unhashable, as they were as dataclasses
+    __hash__ = None
     
+    def __repr__(self) -> str:
+        return (
+            f"DailyWeatherSummary(date={self.date!r}, max_temperature={self.max_temperature!r}, "
+            f"min_temperature={self.min_temperature!r}, weather_conditions={self.weather_conditions!r})"
+        )
+
+
 @dataclass
-class WeatherForecastData:
-    """Raw weather forecast data from the API."""
+class WeatherForecastArrays:
+    """Raw weather forecast data from the API, stored column-wise for daily aggregation."""
     location: Location
-    forecast_conditions: List[WeatherCondition]
+    dates: List[date]
+    t_max: array
+    t_min: array
+    descriptions: List[str]
     retrieved_at: datetime = field(default_factory=datetime.now)
     
+    @classmethod
+    def from_conditions(
+        cls,
+        location: Location,
+        conditions: List[WeatherCondition]
+    ) -> "WeatherForecastArrays":
+        """Build the column arrays from a chronological list of conditions."""
+        return cls(
+            location=location,
+            dates=[c.date for c in conditions],
+            t_max=array("d", [c.temperature_max for c in conditions]),
+            t_min=array("d", [c.temperature_min for c in conditions]),
+            descriptions=[c.description for c in conditions],
+        )
+    
     def get_daily_summaries(self) -> List[DailyWeatherSummary]:
-        """Convert raw conditions to daily summaries."""
-        daily_data: Dict[date, List[WeatherCondition]] = {}
-        
-        # Group conditions by date
-        for condition in self.forecast_conditions:
-            condition_date = condition.date
-            if condition_date not in daily_data:
-                daily_data[condition_date] = []
-            daily_data[condition_date].append(condition)
+        """
+        Convert raw conditions to daily summaries.
         
-        # Create daily summaries
+        Rows are expected in chronological order, as returned by the API, so
+        each day is a contiguous slice of the column arrays.
+        """
         summaries = []
-        for forecast_date, conditions in sorted(daily_data.items()):
-            max_temp = max(c.temperature_max for c in conditions)
-            min_temp = min(c.temperature_min for c in conditions)
-            descriptions = list(set(c.description for c in conditions))
+        start = 0
+        for forecast_date, rows in islice(groupby(self.dates), _FORECAST_DAYS):
+            end = start + sum(1 for _ in rows)
             
             summary = DailyWeatherSummary(
                 date=forecast_date,
-                max_temperature=max_temp,
-                min_temperature=min_temp,
-                weather_conditions=descriptions
+                max_temperature=max(self.t_max[start:end]),
+                min_temperature=min(self.t_min[start:end]),
+                weather_conditions=list(dict.fromkeys(self.descriptions[start:end]))
             )
             summaries.append(summary)
+            start = end
         
-        return summaries[:5]
+        return summaries
 
 
 @dataclass
@@ -143,13 +228,15 @@ class WeatherForecast:
     
     def __post_init__(self):
         """Validate forecast data."""
-        if len(self.daily_summaries) != 5:
-            raise ValueError(f"Expected 5 daily summaries, got {len(self.daily_summaries)}")
+        if len(self.daily_summaries) != _FORECAST_DAYS:
+            raise ValueError(
+                f"Expected {_FORECAST_DAYS} daily summaries, got {len(self.daily_summaries)}"
+            )
         if not self.ai_narrative.strip():
             raise ValueError("AI narrative cannot be empty")
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert forecast to dictionary for JSON serialization."""
+        """Convert forecast to dictionary for JSON serialization (dates are left as date/datetime objects)."""
         return {
             "location": {
                 "latitude": self.location.latitude,
@@ -157,7 +244,7 @@ class WeatherForecast:
             },
             "forecast": [
                 {
-                    "date": summary.formatted_date,
+                    "date": summary.date,
                     "max_temperature": summary.max_temperature,
                     "min_temperature": summary.min_temperature,
                     "conditions": summary.weather_conditions,
@@ -167,9 +254,9 @@ class WeatherForecast:
             ],
             "narrative": self.ai_narrative,
             "style": self.style,
-            "generated_at": self.generated_at.isoformat()
+            "generated_at": self.generated_at
         }
     
     def to_json(self) -> str:
         """Convert forecast to JSON string."""
-        return json.dumps(self.to_dict(), indent=2)
\ No newline at end of file
+        return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2).decode()
\ No newline at end of file
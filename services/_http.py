@@ -0,0 +1,124 @@
+"""
+Shared HTTP client for outbound API calls.
+One connection pool is built on first use and reused by every service.
+"""
+# services/_http.py
+import asyncio
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+import httpx
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Failures after the request was sent; only safe to repeat for idempotent methods
+_RETRYABLE_READ_ERRORS = (httpx.ReadTimeout, httpx.RemoteProtocolError)
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+def _build_client() -> httpx.AsyncClient:
+    """Create an async HTTP client with connection-level retries and a persistent keep-alive pool."""
+    limits = httpx.Limits(
+        max_connections=Settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    return httpx.AsyncClient(
+        timeout=Settings.API_TIMEOUT_SECONDS,
+        transport=httpx.AsyncHTTPTransport(
+            retries=Settings.HTTP_RETRY_ATTEMPTS,
+            limits=limits,
+        ),
+    )
+
+
+# Process-wide client shared by all services; rebuilt lazily after it is closed
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Get the shared client, building a new one if none exists or the last one was closed."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = _build_client()
+        logger.info("Shared HTTP client initialized")
+    return _shared_client
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into a delay, if present.
+    
+    The delay is capped at the request timeout so a long server hint cannot
+    stall a tool call indefinitely.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        # A "-0000" zone yields a naive datetime; HTTP-dates are always UTC
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(0.0, delay), float(Settings.API_TIMEOUT_SECONDS))
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    **kwargs: Any
+) -> httpx.Response:
+    """
+    Send a request with the same retry policy the services used with urllib3.
+    
+    Transient status codes are retried with exponential backoff, honouring
+    Retry-After on 413/429/503. Read timeouts and dropped connections are
+    retried for idempotent methods only; connect errors are retried by the
+    transport itself.
+    """
+    max_attempts = Settings.HTTP_RETRY_ATTEMPTS
+    retry_status_codes = Settings.HTTP_RETRY_STATUS_CODES
+    retry_after_status_codes = Settings.HTTP_RETRY_AFTER_STATUS_CODES
+    backoff_factor = Settings.HTTP_RETRY_BACKOFF_FACTOR
+    
+    for attempt in range(max_attempts + 1):
+        backoff = backoff_factor * (2 ** attempt)
+        try:
+            response = await client.request(method, url, **kwargs)
+        except _RETRYABLE_READ_ERRORS as e:
+            if method.upper() not in _IDEMPOTENT_METHODS or attempt == max_attempts:
+                raise
+            logger.warning("Retrying %s %s after %s", method, url, type(e).__name__)
+            await asyncio.sleep(backoff)
+            continue
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            # Connection reuse shows up as a drop in elapsed time after the first call
+            logger.debug("%s %s -> %s in %s", method, url, response.status_code, response.elapsed)
+        if response.status_code not in retry_status_codes or attempt == max_attempts:
+            break
+        
+        delay = None
+        if response.status_code in retry_after_status_codes:
+            delay = _retry_after_seconds(response)
+        logger.warning("Retrying %s %s after status %s", method, url, response.status_code)
+        await asyncio.sleep(backoff if delay is None else delay)
+        
+    return response
+
+
+async def close_shared_client() -> None:
+    """Close the shared client and release its pooled connections."""
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+        logger.info("Shared HTTP client closed")
@@ -4,16 +4,11 @@ Handles AI prompt construction and response processing.
 """
 # services/ai_service.py
 import logging
-from typing import Dict, Any, List
-import sys
-from pathlib import Path
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
-# Add parent directory to path for settings import
-# sys.path.append(str(Path(__file__).parent.parent))
+from typing import Dict, Any, List, Optional
+import httpx
+from openai import AsyncOpenAI
 
+from services._http import get_shared_client
 from services.key_vault_service import KeyVaultService
 from config.settings import Settings
 
@@ -24,40 +19,39 @@ class AIService:
     
     def __init__(self, key_vault_service: KeyVaultService):
         self.key_vault_service = key_vault_service
-        self.api_url = Settings.OPENAI_API_URL
+        self.base_url = Settings.OPENAI_BASE_URL
         self.api_key_secret_name = Settings.OPENAI_API_KEY_SECRET
         self.model = Settings.OPENAI_MODEL
         self.max_tokens = Settings.OPENAI_MAX_COMPLETION_TOKENS
         self.temperature = Settings.OPENAI_TEMPERATURE
         self.timeout = Settings.API_TIMEOUT_SECONDS
-        self._api_key: str = None
-        self._session: requests.Session = None
+        self._client: Optional[AsyncOpenAI] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
         
-    def _create_session(self) -> requests.Session:
-        """Create a requests session with retry strategy."""
-        if self._session is None:
-            session = requests.Session()
-            
-            retry_strategy = Retry(
-                total=3,
-                backoff_factor=1,
-                status_forcelist=[429, 500, 502, 503, 504],
+    async def _get_client(self) -> AsyncOpenAI:
+        """Get the OpenAI client, rebuilding it when the API key rotates or the shared HTTP client is replaced."""
+        api_key = await self._get_api_key()
+        http_client = get_shared_client()
+        if (
+            self._client is None
+            or self._client.api_key != api_key
+            or self._http_client is not http_client
+        ):
+            self._http_client = http_client
+            self._client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=Settings.HTTP_RETRY_ATTEMPTS,
+                http_client=http_client,
             )
+            logger.info("AI service OpenAI client initialized")
             
-            adapter = HTTPAdapter(max_retries=retry_strategy)
-            session.mount("http://", adapter)
-            session.mount("https://", adapter)
-            
-            self._session = session
-            logger.info("AI service HTTP session initialized")
-            
-        return self._session
+        return self._client
     
     async def _get_api_key(self) -> str:
-        """Get OpenAI API key from Key Vault using settings."""
-        if self._api_key is None:
-            self._api_key = await self.key_vault_service.get_secret(self.api_key_secret_name)
-        return self._api_key
+        """Get OpenAI API key from the Key Vault service's TTL cache."""
+        return await self.key_vault_service.get_secret(self.api_key_secret_name)
     
     async def generate_weather_insights(
         self, 
@@ -67,49 +61,41 @@ class AIService:
     ) -> str:
         """Generate AI-powered weather insights using settings configuration."""
         try:
-            api_key = await self._get_api_key()
-            session = self._create_session()
+            client = await self._get_client()
             
             # Prepare weather context
-            weather_context = f"""
-Current weather in {location}:
-- Temperature: {current_weather['temp']}°C (feels like {current_weather['feels_like']}°C)
-- Condition: {current_weather['description']}
-- Humidity: {current_weather['humidity']}%
-- Wind: {current_weather['wind_speed']} kph
-
-5-day forecast:"""
-            
-            for day in forecast:
-                weather_context += f"\n- {day['date']}: {day['temp_high']}°/{day['temp_low']}° - {day['description']}"
-            
-            response = session.post(
-                self.api_url,
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a professional meteorologist. Provide practical weather insights and recommendations based on the data."
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Analyze this weather data and provide insights:\n{weather_context}"
-                        }
-                    ],
-                    "max_tokens": self.max_tokens,
-                    "temperature": self.temperature
-                },
-                timeout=self.timeout
+            lines = [
+                "",
+                f"Current weather in {location}:",
+                f"- Temperature: {current_weather['temp']}°C (feels like {current_weather['feels_like']}°C)",
+                f"- Condition: {current_weather['description']}",
+                f"- Humidity: {current_weather['humidity']}%",
+                f"- Wind: {current_weather['wind_speed']} kph",
+                "",
+                "5-day forecast:",
+            ]
+            lines.extend(
+                f"- {day['date']}: {day['temp_high']}°/{day['temp_low']}° - {day['description']}"
+                for day in forecast
             )
-            response.raise_for_status()
+            weather_context = "\n".join(lines)
             
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
+            completion = await client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a professional meteorologist. Provide practical weather insights and recommendations based on the data."
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Analyze this weather data and provide insights:\n{weather_context}"
+                    }
+                ],
+                max_tokens=self.max_tokens,
+                temperature=self.temperature
+            )
+            return completion.choices[0].message.content
                 
         except Exception as e:
             logger.error("AI insights generation failed: %s", e)
@@ -3,19 +3,22 @@ Azure Key Vault service for secure API key retrieval.
 Provides a clean abstraction over Azure Key Vault operations.
 """
 # services/key_vault_service.py
+import asyncio
 import logging
-from typing import Optional
-import sys
-from pathlib import Path
+import time
+from typing import Dict, Optional, Tuple
 from azure.keyvault.secrets import SecretClient
-from azure.identity import DefaultAzureCredential, ChainedTokenCredential, ManagedIdentityCredential, AzureCliCredential
+from azure.identity import ManagedIdentityCredential, AzureCliCredential
 from config.settings import Settings
 
-# Add parent directory to path for settings import
-# sys.path.append(str(Path(__file__).parent.parent))
-
 logger = logging.getLogger(__name__)
 
+# Process-wide secret cache shared by every KeyVaultService instance: name -> (fetched_at, value)
+_secret_cache: Dict[str, Tuple[float, str]] = {}
+# One lock per secret name: concurrent callers for the same secret share a single fetch,
+# while different secrets (OpenWeather, OpenAI) are fetched in parallel
+_secret_locks: Dict[str, asyncio.Lock] = {}
+
 class KeyVaultService:
     """Professional Key Vault service using settings configuration."""
     
@@ -25,24 +28,28 @@ class KeyVaultService:
         
         self.key_vault_name = Settings.KEY_VAULT_NAME
         self.key_vault_url = f"https://{self.key_vault_name}.vault.azure.net/"
+        self.secret_cache_ttl = Settings.SECRET_CACHE_TTL_SECONDS
+        # Resolve the credential type once instead of probing a fallback chain
+        self._credential_class = (
+            ManagedIdentityCredential if Settings.USE_MANAGED_IDENTITY else AzureCliCredential
+        )
         self._client: Optional[SecretClient] = None
         
     def _get_client(self) -> SecretClient:
-        """Get authenticated Key Vault client with fallback credentials."""
+        """Get authenticated Key Vault client using the resolved credential."""
         if self._client is None:
             try:
-                # Use your Azure credential configuration
-                credential = ChainedTokenCredential(
-                    ManagedIdentityCredential(),
-                    AzureCliCredential(),
-                    DefaultAzureCredential(**Settings.get_azure_credential_config())
-                )
+                credential = self._credential_class()
                 
                 self._client = SecretClient(
                     vault_url=self.key_vault_url,
                     credential=credential
                 )
-                logger.info("Key Vault client initialized for vault: %s", self.key_vault_name)
+                logger.info(
+                    "Key Vault client initialized for vault %s using %s",
+                    self.key_vault_name,
+                    self._credential_class.__name__
+                )
                 
             except Exception as e:
                 logger.error("Failed to initialize Key Vault client: %s", e)
@@ -50,21 +57,45 @@ class KeyVaultService:
                 
         return self._client
     
+    def _get_cached_secret(self, secret_name: str) -> Optional[str]:
+        """Return the cached secret value if it is still within its TTL."""
+        cached = _secret_cache.get(secret_name)
+        if cached is not None and time.monotonic() - cached[0] < self.secret_cache_ttl:
+            return cached[1]
+        return None
+    
     async def get_secret(self, secret_name: str) -> str:
-        """Retrieve secret from Key Vault."""
-        try:
-            client = self._get_client()
-            secret = client.get_secret(secret_name)
-            logger.info("Successfully retrieved secret: %s", secret_name)
-            return secret.value
+        """Retrieve secret from Key Vault, serving repeat lookups from the process-wide TTL cache."""
+        cached = self._get_cached_secret(secret_name)
+        if cached is not None:
+            return cached
+        
+        lock = _secret_locks.get(secret_name)
+        if lock is None:
+            lock = _secret_locks[secret_name] = asyncio.Lock()
+        
+        async with lock:
+            # Another coroutine may have fetched it while we waited
+            cached = self._get_cached_secret(secret_name)
+            if cached is not None:
+                return cached
             
-        except Exception as e:
-            logger.error("Failed to retrieve secret %s: %s", secret_name, e)
-            raise RuntimeError(f"Unable to retrieve secret {secret_name}") from e    
-    def get_openweather_api_key(self) -> str:
+            try:
+                client = self._get_client()
+                secret = await asyncio.to_thread(client.get_secret, secret_name)
+                logger.info("Successfully retrieved secret: %s", secret_name)
+                
+            except Exception as e:
+                logger.error("Failed to retrieve secret %s: %s", secret_name, e)
+                raise RuntimeError(f"Unable to retrieve secret {secret_name}") from e
+            
+            _secret_cache[secret_name] = (time.monotonic(), secret.value)
+            return secret.value
+    
+    async def get_openweather_api_key(self) -> str:
         """Get the OpenWeatherMap API key."""
-        return self.get_secret(Settings.OPENWEATHER_API_KEY_SECRET)
+        return await self.get_secret(Settings.OPENWEATHER_API_KEY_SECRET)
     
-    def get_openai_api_key(self) -> str:
+    async def get_openai_api_key(self) -> str:
         """Get the OpenAI API key."""
-        return self.get_secret(Settings.OPENAI_API_KEY_SECRET)
\ No newline at end of file
+        return await self.get_secret(Settings.OPENAI_API_KEY_SECRET)
\ No newline at end of file
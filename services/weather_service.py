@@ -4,21 +4,40 @@ Handles API calls, response parsing, and error handling.
 """
 # services/weather_service.py
 import logging
-from typing import Dict, Any, List
+from functools import lru_cache
+from itertools import groupby, islice
+from typing import Dict, Any, List, NoReturn, Optional, Tuple
+import asyncio
+import math
 import sys
-from pathlib import Path
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import time
+import httpx
+import orjson
 
-# Add parent directory to path for settings import
-# sys.path.append(str(Path(__file__).parent.parent))
+from services._http import get_shared_client, request_with_retry
 from services.key_vault_service import KeyVaultService
 from config.settings import Settings
 
 
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of decoded OpenWeather responses: (url, location) -> (fetched_at, data)
+_response_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+_response_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+# One lock per cache key so concurrent misses for the same request share a single fetch
+_response_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+# Transport and payload-shape failures wrapped as RuntimeError; anything else
+# (e.g. Key Vault errors, already RuntimeError) propagates unchanged
+_RESPONSE_ERRORS = (httpx.HTTPError, orjson.JSONDecodeError, KeyError, IndexError, TypeError)
+
+
+@lru_cache(maxsize=128)
+def _title(description: str) -> str:
+    """Title-case an OpenWeather description; the vocabulary is small, so results are memoized and interned."""
+    return sys.intern(description.title())
+
+
 class WeatherService:
     """Professional weather service with settings-based configuration."""
     
@@ -27,125 +46,170 @@ class WeatherService:
         self.base_url = Settings.OPENWEATHER_BASE_URL
         self.forecast_endpoint = Settings.OPENWEATHER_FORECAST_ENDPOINT
         self.api_key_secret_name = Settings.OPENWEATHER_API_KEY_SECRET
-        self.timeout = Settings.API_TIMEOUT_SECONDS
-        self._api_key: str = None
-        self._session: requests.Session = None
+        self.cache_ttl = Settings.WEATHER_CACHE_TTL_SECONDS
+        self.cache_max_entries = Settings.WEATHER_CACHE_MAX_ENTRIES
+        self.forecast_days = Settings.EXPECTED_FORECAST_DAYS
+        self._fixed_params: Optional[Tuple[Tuple[str, str], ...]] = None
+    
+    async def _get_api_key(self) -> str:
+        """Get OpenWeather API key from the Key Vault service's TTL cache."""
+        return await self.key_vault_service.get_secret(self.api_key_secret_name)
+    
+    async def _get_fixed_params(self) -> Tuple[Tuple[str, str], ...]:
+        """Get the query params shared by every request, rebuilt only when the API key rotates."""
+        api_key = await self._get_api_key()
+        if self._fixed_params is None or self._fixed_params[0][1] != api_key:
+            self._fixed_params = (("appid", api_key), ("units", "metric"))
+        return self._fixed_params
+    
+    @staticmethod
+    def _log_cache_event(event: str, key: Tuple[str, str]) -> None:
+        """Log a response cache lookup; running totals are reported on misses only."""
+        if event == "miss":
+            logger.info(
+                "Response cache miss for %s (hits=%d, misses=%d)",
+                key,
+                _response_cache_stats["hits"],
+                _response_cache_stats["misses"]
+            )
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response cache %s for %s", event, key)
+    
+    def _get_cached_response(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Return the cached response if it is still within its TTL."""
+        cached = _response_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+        return None
+    
+    async def _fetch(self, url: str, location: str) -> Dict[str, Any]:
+        """Fetch and decode an OpenWeather endpoint, serving recent responses from cache."""
+        key = (url, location.strip().lower())
+        
+        cached = self._get_cached_response(key)
+        if cached is not None:
+            _response_cache_stats["hits"] += 1
+            self._log_cache_event("hit", key)
+            return cached
+        
+        lock = _response_locks.get(key)
+        if lock is None:
+            lock = _response_locks[key] = asyncio.Lock()
         
-    def _create_session(self) -> requests.Session:
-        """Create a requests session with retry strategy."""
-        if self._session is None:
-            session = requests.Session()
+        async with lock:
+            # Another coroutine may have fetched it while we waited; that counts as a hit
+            cached = self._get_cached_response(key)
+            if cached is not None:
+                _response_cache_stats["hits"] += 1
+                self._log_cache_event("hit", key)
+                return cached
             
-            # Your proven retry strategy
-            retry_strategy = Retry(
-                total=3,
-                backoff_factor=1,
-                status_forcelist=[429, 500, 502, 503, 504],
+            _response_cache_stats["misses"] += 1
+            self._log_cache_event("miss", key)
+            
+            fixed_params = await self._get_fixed_params()
+            
+            response = await request_with_retry(
+                get_shared_client(),
+                "GET",
+                url,
+                params=(("q", location),) + fixed_params
             )
+            response.raise_for_status()
             
-            adapter = HTTPAdapter(max_retries=retry_strategy)
-            session.mount("http://", adapter)
-            session.mount("https://", adapter)
+            data = orjson.loads(response.content)
             
-            self._session = session
-            logger.info("HTTP session initialized with retry strategy")
+            # Re-insert refreshed keys at the end so eviction order stays oldest-first
+            _response_cache.pop(key, None)
+            if len(_response_cache) >= self.cache_max_entries:
+                evicted = next(iter(_response_cache))
+                del _response_cache[evicted]
+                _response_locks.pop(evicted, None)
+            _response_cache[key] = (time.monotonic(), data)
             
-        return self._session
+            return data
     
-    async def _get_api_key(self) -> str:
-        """Get OpenWeather API key from Key Vault using settings."""
-        if self._api_key is None:
-            self._api_key = await self.key_vault_service.get_secret(self.api_key_secret_name)
-        return self._api_key
+    @staticmethod
+    def _raise_for_status_error(location: str, error: httpx.HTTPStatusError) -> NoReturn:
+        """Translate an OpenWeather HTTP error status into the service's exception types."""
+        logger.error("OpenWeather API error for %s: %s", location, error)
+        if error.response.status_code == 404:
+            raise ValueError(f"Location '{location}' not found") from error
+        raise RuntimeError(f"Weather service unavailable: {error.response.status_code}") from error
+    
+    async def warmup(self) -> None:
+        """Fetch the API key and open a pooled connection so the first tool call skips DNS/TLS setup."""
+        try:
+            await self._get_api_key()
+            # Any response status will do; the goal is an established keep-alive connection
+            await get_shared_client().head(self.base_url)
+            logger.info("OpenWeather connection warmed up")
+            
+        except Exception as e:
+            logger.warning("OpenWeather warmup failed: %s", e)
     
     async def get_current_weather(self, location: str) -> Dict[str, Any]:
         """Get current weather data for location."""
         try:
-            api_key = await self._get_api_key()
-            session = self._create_session()
-            
-            response = session.get(
-                f"{self.base_url}/weather",
-                params={
-                    "q": location,
-                    "appid": api_key,
-                    "units": "metric"
-                },
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self._fetch(f"{self.base_url}/weather", location)
             
             return {
                 "location": data["name"],
                 "temp": round(data["main"]["temp"]),
                 "feels_like": round(data["main"]["feels_like"]),
-                "description": data["weather"][0]["description"].title(),
+                "description": _title(data["weather"][0]["description"]),
                 "humidity": data["main"]["humidity"],
                 "wind_speed": round(data["wind"]["speed"]),
                 "wind_direction": data["wind"].get("deg", 0)
             }
             
-        except requests.exceptions.HTTPError as e:
-            logger.error("OpenWeather API error for %s: %s", location, e)
-            if e.response.status_code == 404:
-                raise ValueError(f"Location '{location}' not found")
-            raise RuntimeError(f"Weather service unavailable: {e.response.status_code}")
+        except httpx.HTTPStatusError as e:
+            self._raise_for_status_error(location, e)
             
-        except Exception as e:
+        except _RESPONSE_ERRORS as e:
             logger.error("Weather request failed for %s: %s", location, e)
             raise RuntimeError(f"Unable to get weather for {location}") from e
     
     async def get_forecast(self, location: str) -> List[Dict[str, Any]]:
         """Get 5-day forecast for location with proper daily aggregation."""
         try:
-            api_key = await self._get_api_key()
-            session = self._create_session()
+            data = await self._fetch(self.forecast_endpoint, location)
             
-            response = session.get(
-                self.forecast_endpoint,
-                params={
-                    "q": location,
-                    "appid": api_key,
-                    "units": "metric"
-                },
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Group by date first (like Azure Function does)
-            daily_data = {}
-            for item in data["list"]:
-                forecast_date = item["dt_txt"].split()[0]
-                if forecast_date not in daily_data:
-                    daily_data[forecast_date] = []
-                daily_data[forecast_date].append(item)
+            # Items arrive in chronological order, so consecutive entries share a date
+            days = groupby(data["list"], key=lambda item: item["dt_txt"][:10])
             
             # Aggregate daily min/max properly
             daily_forecasts = []
-            for date, entries in sorted(daily_data.items()):
-                if len(daily_forecasts) >= Settings.EXPECTED_FORECAST_DAYS:
-                    break
-                    
-                # Find true daily min/max across all 3-hour periods
-                temp_highs = [entry["main"]["temp_max"] for entry in entries]
-                temp_lows = [entry["main"]["temp_min"] for entry in entries]
-                descriptions = list(set(entry["weather"][0]["description"] for entry in entries))
+            for date, entries in islice(days, self.forecast_days):
+                entries = list(entries)
+                
+                # Find true daily min/max across all 3-hour periods in a single pass
+                temp_high = -math.inf
+                temp_low = math.inf
+                descriptions = {}  # Insertion-ordered set
+                for entry in entries:
+                    main = entry["main"]
+                    if main["temp_max"] > temp_high:
+                        temp_high = main["temp_max"]
+                    if main["temp_min"] < temp_low:
+                        temp_low = main["temp_min"]
+                    descriptions[sys.intern(entry["weather"][0]["description"])] = None
                 
+                first = entries[0]
                 daily_forecasts.append({
                     "date": date,
-                    "temp_high": round(max(temp_highs)),    # True daily maximum
-                    "temp_low": round(min(temp_lows)),      # True daily minimum
+                    "temp_high": round(temp_high),    # True daily maximum
+                    "temp_low": round(temp_low),      # True daily minimum
                     "description": ", ".join(descriptions),
-                    "humidity": entries[0]["main"]["humidity"],  # First entry for consistency
-                    "wind_speed": round(entries[0]["wind"]["speed"])
+                    "humidity": first["main"]["humidity"],  # First entry for consistency
+                    "wind_speed": round(first["wind"]["speed"])
                 })
                     
             return daily_forecasts
                 
-        except Exception as e:
+        except httpx.HTTPStatusError as e:
+            self._raise_for_status_error(location, e)
+            
+        except _RESPONSE_ERRORS as e:
             logger.error("Forecast request failed for %s: %s", location, e)
             raise RuntimeError(f"Unable to get forecast for {location}") from e
\ No newline at end of file
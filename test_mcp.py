@@ -1,10 +1,17 @@
 # test_mcp.py
 import asyncio
-import sys
 
-# Add parent directory to path for settings import
-# sys.path.append(str(Path(__file__).parent.parent))
 from main import mcp
+from services._http import close_shared_client
+
+async def _run_tool(label: str, tool_name: str, arguments: dict) -> None:
+    """Call a single MCP tool and print a truncated result."""
+    try:
+        result = await mcp.call_tool(tool_name, arguments)
+        print(f"✅ {label}:", result[:100] + "..." if len(result) > 100 else result)
+        
+    except Exception as e:
+        print(f"❌ {label} failed:", e)
 
 async def test_mcp_tools():
     """Test MCP server tools directly."""
@@ -14,34 +21,18 @@ async def test_mcp_tools():
     # Test location
     test_location = "Seattle"
     
+    # Run all three tools concurrently; total time tracks the slowest call (AI insights)
+    print(f"\n🚀 Testing current weather, forecast and AI insights for {test_location}...")
     try:
-        # Test 1: Current Weather
-        print(f"\n1️⃣ Testing current weather for {test_location}...")
-        weather_result = await mcp.call_tool("get_current_weather", {"location": test_location})
-        print("✅ Current weather:", weather_result[:100] + "..." if len(weather_result) > 100 else weather_result)
-        
-    except Exception as e:
-        print("❌ Current weather failed:", e)
-    
-    try:
-        # Test 2: Weather Forecast
-        print(f"\n2️⃣ Testing forecast for {test_location}...")
-        forecast_result = await mcp.call_tool("get_weather_forecast", {"location": test_location})
-        print("✅ Forecast:", forecast_result[:100] + "..." if len(forecast_result) > 100 else forecast_result)
-        
-    except Exception as e:
-        print("❌ Forecast failed:", e)
-    
-    try:
-        # Test 3: AI Insights (might take longer)
-        print(f"\n3️⃣ Testing AI insights for {test_location}...")
-        insights_result = await mcp.call_tool("get_weather_insights", {"location": test_location})
-        print("✅ AI Insights:", insights_result[:100] + "..." if len(insights_result) > 100 else insights_result)
-        
-    except Exception as e:
-        print("❌ AI insights failed:", e)
+        await asyncio.gather(
+            _run_tool("Current weather", "get_current_weather", {"location": test_location}),
+            _run_tool("Forecast", "get_weather_forecast", {"location": test_location}),
+            _run_tool("AI Insights", "get_weather_insights", {"location": test_location}),
+        )
+    finally:
+        await close_shared_client()
     
     print("\n🎉 MCP tool testing complete!")
 
 if __name__ == "__main__":
-    asyncio.run(test_mcp_tools())
\ No newline at end of file
+    asyncio.run(test_mcp_tools())
@@ -0,0 +1,206 @@
+"""
+Tests for the shared HTTP retry policy and the Key Vault secret cache.
+Requests go through httpx.MockTransport; backoff sleeps are recorded, not awaited.
+"""
+import asyncio
+import threading
+import time
+from typing import List
+
+import httpx
+import pytest
+
+import services._http as http_module
+import services.key_vault_service as key_vault_module
+from services._http import _retry_after_seconds, request_with_retry
+from services.key_vault_service import KeyVaultService
+from config.settings import Settings
+
+
+URL = "https://api.example.test/data"
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> List[float]:
+    """Record retry delays instead of sleeping."""
+    delays: List[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr(http_module.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def _run_request(handler, method: str = "GET") -> httpx.Response:
+    """Send one request through request_with_retry against a mock transport."""
+    async def run() -> httpx.Response:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await request_with_retry(client, method, URL)
+
+    return asyncio.run(run())
+
+
+def test_retries_transient_status_with_backoff(sleeps):
+    statuses = iter([503, 502, 200])
+
+    response = _run_request(lambda request: httpx.Response(next(statuses)))
+
+    assert response.status_code == 200
+    backoff = Settings.HTTP_RETRY_BACKOFF_FACTOR
+    assert sleeps == [backoff, backoff * 2]
+
+
+def test_returns_last_response_when_retries_exhausted(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    response = _run_request(handler)
+
+    assert response.status_code == 500
+    assert len(calls) == Settings.HTTP_RETRY_ATTEMPTS + 1
+
+
+def test_does_not_retry_client_errors(sleeps):
+    response = _run_request(lambda request: httpx.Response(404))
+
+    assert response.status_code == 404
+    assert sleeps == []
+
+
+def test_honours_retry_after_seconds(sleeps):
+    responses = iter([httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200)])
+
+    response = _run_request(lambda request: next(responses))
+
+    assert response.status_code == 200
+    assert sleeps == [2.0]
+
+
+def test_retry_after_ignored_for_statuses_without_it(sleeps):
+    responses = iter([httpx.Response(502, headers={"Retry-After": "2"}), httpx.Response(200)])
+
+    _run_request(lambda request: next(responses))
+
+    assert sleeps == [Settings.HTTP_RETRY_BACKOFF_FACTOR]
+
+
+def test_retry_after_naive_http_date_is_treated_as_utc(sleeps):
+    # A "-0000" zone parses to a naive datetime; a past date means retry immediately
+    retry_after = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 -0000"}
+    responses = iter([httpx.Response(429, headers=retry_after), httpx.Response(200)])
+
+    response = _run_request(lambda request: next(responses))
+
+    assert response.status_code == 200
+    assert sleeps == [0.0]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("3600", float(Settings.API_TIMEOUT_SECONDS)),
+    ("Wed, 21 Oct 2099 07:28:00 GMT", float(Settings.API_TIMEOUT_SECONDS)),
+    ("-5", 0.0),
+    ("not a date", None),
+])
+def test_retry_after_parsing(value, expected):
+    response = httpx.Response(429, headers={"Retry-After": value})
+
+    assert _retry_after_seconds(response) == expected
+
+
+def test_retry_after_missing_header():
+    assert _retry_after_seconds(httpx.Response(429)) is None
+
+
+def test_read_timeout_retried_for_get(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200)
+
+    response = _run_request(handler, "GET")
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+def test_read_timeout_not_retried_for_post(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    with pytest.raises(httpx.ReadTimeout):
+        _run_request(handler, "POST")
+
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+class _FakeSecret:
+    def __init__(self, value: str):
+        self.value = value
+
+
+class _FakeSecretClient:
+    """Stands in for SecretClient; counts fetches and returns a fresh value each time."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_secret(self, name: str) -> _FakeSecret:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.delay)
+        return _FakeSecret(f"{name}-v{call}")
+
+
+@pytest.fixture
+def key_vault(monkeypatch):
+    """KeyVaultService with a fake client and an empty process-wide cache."""
+    monkeypatch.setattr(key_vault_module, "_secret_cache", {})
+    monkeypatch.setattr(key_vault_module, "_secret_locks", {})
+    service = KeyVaultService()
+    service._client = _FakeSecretClient(delay=0.05)
+    return service
+
+
+def test_secret_served_from_cache_within_ttl(key_vault):
+    async def run():
+        return [await key_vault.get_secret("OWM-API-KEY") for _ in range(3)]
+
+    assert asyncio.run(run()) == ["OWM-API-KEY-v1"] * 3
+    assert key_vault._client.calls == 1
+
+
+def test_secret_refetched_after_ttl_expiry(key_vault):
+    async def run():
+        first = await key_vault.get_secret("OWM-API-KEY")
+        # Age the cached entry past its TTL
+        fetched_at, value = key_vault_module._secret_cache["OWM-API-KEY"]
+        key_vault_module._secret_cache["OWM-API-KEY"] = (
+            fetched_at - key_vault.secret_cache_ttl - 1, value
+        )
+        return first, await key_vault.get_secret("OWM-API-KEY")
+
+    assert asyncio.run(run()) == ("OWM-API-KEY-v1", "OWM-API-KEY-v2")
+    assert key_vault._client.calls == 2
+
+
+def test_concurrent_get_secret_shares_one_fetch(key_vault):
+    async def run():
+        return await asyncio.gather(*(key_vault.get_secret("OWM-API-KEY") for _ in range(5)))
+
+    assert asyncio.run(run()) == ["OWM-API-KEY-v1"] * 5
+    assert key_vault._client.calls == 1
+